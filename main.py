@@ -10,6 +10,8 @@ sys.path.insert(0, str(Path(__file__).resolve().parent))
 from src.game_orchestrator import GameOrchestrator
 from src.types import CHARACTER_IDS, CharacterId
 
+_CHOICE_MAP = {"1": "Crumbs", "2": "Cherry", "3": "Glaze"}
+
 
 def main() -> None:
     orch = GameOrchestrator()
@@ -21,17 +23,16 @@ def main() -> None:
         state = orch.get_state()
         if not state or state.phase != "interrogation":
             break
-        remaining = {cid: state.character_states[cid].questions_remaining for cid in CHARACTER_IDS}
-        if all(remaining[cid] == 0 for cid in CHARACTER_IDS):
+        if all(state.character_states[cid].questions_remaining == 0 for cid in CHARACTER_IDS):
             print("You have no questions left. Time to accuse.")
             break
 
-        print("Questions left:", ", ".join(f"{c}: {remaining[c]}" for c in CHARACTER_IDS))
+        print("Questions left:", ", ".join(f"{c}: {state.character_states[c].questions_remaining}" for c in CHARACTER_IDS))
         print("Choose who to question: 1=Crumbs, 2=Cherry, 3=Glaze, 0=Accuse now")
         choice = input("> ").strip()
         if choice == "0":
             break
-        idx = {"1": "Crumbs", "2": "Cherry", "3": "Glaze"}.get(choice)
+        idx = _CHOICE_MAP.get(choice)
         if idx is None or idx not in CHARACTER_IDS:
             print("Invalid choice.")
             continue
@@ -51,7 +52,7 @@ def main() -> None:
 
     print("\nWho do you accuse? 1=Crumbs, 2=Cherry, 3=Glaze")
     acc = input("> ").strip()
-    accused = {"1": "Crumbs", "2": "Cherry", "3": "Glaze"}.get(acc)
+    accused = _CHOICE_MAP.get(acc)
     if accused not in CHARACTER_IDS:
         print("Invalid. Exiting.")
         return
@@ -1,12 +1,17 @@
 """Orchestrates AI: character agents, model routing, and integration with memory/transcript."""
-import time
-from typing import Dict, List, Optional
+import asyncio
+import concurrent.futures
+from dataclasses import asdict
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
 
+from .analysis_engine import extract_claims_simple
 from .character_agent import CharacterAgent
+from .inference_server import get_ollama_aclient
 from .config import MODEL_MAP, PERSONA_SYSTEM_PROMPTS
 from .memory_manager import MemoryManager
 from .transcript_manager import TranscriptManager
-from .types import CHARACTER_IDS, CharacterId, GameState, TranscriptTurn
+from .types import CHARACTER_IDS, CharacterId, Claim, GameState, TranscriptTurn
 
 
 class AIManager:
@@ -23,6 +28,9 @@ class AIManager:
         self.model_map = model_map or MODEL_MAP
         self._agents: Dict[CharacterId, CharacterAgent] = {}
         self._game_state: Optional[GameState] = None
+        # Single worker keeps per-session write ordering while moving disk I/O
+        # (fsyncs, summary rebuilds) off the turn's critical path.
+        self._writer = concurrent.futures.ThreadPoolExecutor(max_workers=1)
 
     def set_game_state(self, state: GameState) -> None:
         """Inject current game state so AIManager knows who is guilty and can pass contradiction notes."""
@@ -41,6 +49,25 @@ class AIManager:
             )
             self._agents[cid] = agent
 
+    async def warmup_all(self) -> None:
+        """Force all character models resident with concurrent one-token requests."""
+        try:
+            client = get_ollama_aclient()
+        except RuntimeError:
+            return
+
+        async def _warm(model_name: str) -> None:
+            try:
+                await client.chat(
+                    model=model_name,
+                    messages=[{"role": "user", "content": "hi"}],
+                    options={"num_predict": 1},
+                )
+            except Exception:
+                pass  # warmup is best-effort; the real call will surface errors
+
+        await asyncio.gather(*[_warm(agent.model_name) for agent in self._agents.values()])
+
     def get_character_agent(self, character_id: CharacterId) -> CharacterAgent:
         return self._agents[character_id]
 
@@ -72,16 +99,153 @@ class AIManager:
             turn_id=turn_id,
             character_id=character_id,
             speaker_type="NPC",
-            timestamp=time.strftime("%Y-%m-%dT%H:%M:%S"),
+            timestamp=datetime.now().isoformat(timespec="seconds"),
             player_question=player_question,
             raw_output=raw_output,
             structured_claims=[],
             metadata={"suspicion_snapshot": suspicion_snapshot or {}},
         )
+        self._writer.submit(self._persist_turn, session_id, character_id, turn)
+        return turn
+
+    def _persist_turn(self, session_id: str, character_id: CharacterId, turn: TranscriptTurn) -> None:
         self.transcript_manager.log_turn(session_id, character_id, turn)
         all_turns = self.transcript_manager.get_character_turns(session_id, character_id)
         self.memory_manager.maybe_summarize_character(session_id, character_id, all_turns)
+
+    async def ask_character_async(
+        self,
+        session_id: str,
+        character_id: CharacterId,
+        turn_id: int,
+        player_question: str,
+        suspicion_snapshot: Optional[Dict[CharacterId, float]] = None,
+        contradictions_for_character: Optional[List[str]] = None,
+    ) -> TranscriptTurn:
+        """Async variant of ask_character that does NOT persist; callers persist after gather."""
+        agent = self.get_character_agent(character_id)
+        recent_turns = self.transcript_manager.get_character_last_n_turns(session_id, character_id, 5)
+        summary = self.memory_manager.load_memory_summary(session_id, character_id)
+        contradiction_notes = contradictions_for_character or []
+
+        raw_output = await agent.aanswer_question(
+            session_id=session_id,
+            turn_id=turn_id,
+            player_question=player_question,
+            memory_summary=summary,
+            recent_turns=recent_turns,
+            contradiction_notes=contradiction_notes,
+        )
+
+        return TranscriptTurn(
+            session_id=session_id,
+            turn_id=turn_id,
+            character_id=character_id,
+            speaker_type="NPC",
+            timestamp=datetime.now().isoformat(timespec="seconds"),
+            player_question=player_question,
+            raw_output=raw_output,
+            structured_claims=[],
+            metadata={"suspicion_snapshot": suspicion_snapshot or {}},
+        )
+
+    async def ask_character_stream(
+        self,
+        session_id: str,
+        character_id: CharacterId,
+        turn_id: int,
+        player_question: str,
+        suspicion_snapshot: Optional[Dict[CharacterId, float]] = None,
+        contradictions_for_character: Optional[List[str]] = None,
+        on_token: Optional[Callable[[str], None]] = None,
+    ) -> TranscriptTurn:
+        """Stream the model's answer; claim extraction runs on completed sentences
+        while later tokens are still decoding, so it adds no wall-clock cost."""
+        agent = self.get_character_agent(character_id)
+        recent_turns = self.transcript_manager.get_character_last_n_turns(session_id, character_id, 5)
+        summary = self.memory_manager.load_memory_summary(session_id, character_id)
+        prompt = agent.build_prompt(
+            session_id=session_id,
+            turn_id=turn_id,
+            player_question=player_question,
+            memory_summary=summary,
+            recent_turns=recent_turns,
+            contradiction_notes=contradictions_for_character or [],
+        )
+
+        buffer = ""
+        processed = 0
+        claims: List[Claim] = []
+        async for chunk in agent.astream_model(prompt):
+            if on_token:
+                on_token(chunk)
+            buffer += chunk
+            boundary = max(buffer.rfind(".", processed), buffer.rfind("\n", processed))
+            if boundary >= processed:
+                segment = buffer[processed:boundary + 1]
+                claims.extend(
+                    c for c in extract_claims_simple(segment, character_id, turn_id)
+                    if c.time or c.location
+                )
+                processed = boundary + 1
+        tail = buffer[processed:]
+        if tail.strip():
+            claims.extend(
+                c for c in extract_claims_simple(tail, character_id, turn_id)
+                if c.time or c.location
+            )
+        raw_output = buffer.strip()
+        if raw_output.startswith("["):
+            claims = []  # error sentinel; don't turn it into claims
+        elif not claims and raw_output:
+            # Nothing time/location-shaped anywhere; fall back to the whole-text claim.
+            claims = extract_claims_simple(raw_output, character_id, turn_id)
+
+        turn = TranscriptTurn(
+            session_id=session_id,
+            turn_id=turn_id,
+            character_id=character_id,
+            speaker_type="NPC",
+            timestamp=datetime.now().isoformat(timespec="seconds"),
+            player_question=player_question,
+            raw_output=raw_output,
+            structured_claims=[asdict(c) for c in claims],
+            metadata={"suspicion_snapshot": suspicion_snapshot or {}},
+        )
+        self._writer.submit(self._persist_turn, session_id, character_id, turn)
         return turn
 
+    async def ask_characters_batch(
+        self,
+        session_id: str,
+        requests: List[Tuple[CharacterId, int, str]],
+        suspicion_snapshot: Optional[Dict[CharacterId, float]] = None,
+        contradictions_by_character: Optional[Dict[CharacterId, List[str]]] = None,
+    ) -> List[TranscriptTurn]:
+        """Fire all model calls concurrently; persist turns only after the gather returns."""
+        notes = contradictions_by_character or {}
+        turns = await asyncio.gather(
+            *[
+                self.ask_character_async(
+                    session_id=session_id,
+                    character_id=cid,
+                    turn_id=turn_id,
+                    player_question=question,
+                    suspicion_snapshot=suspicion_snapshot,
+                    contradictions_for_character=notes.get(cid),
+                )
+                for cid, turn_id, question in requests
+            ]
+        )
+        for turn in turns:
+            assert turn.character_id is not None
+            self._writer.submit(self._persist_turn, session_id, turn.character_id, turn)
+        return list(turns)
+
     def shutdown_session(self, session_id: str) -> None:
+        # Drain pending writes so transcripts are durable before the reveal.
+        self._writer.shutdown(wait=True)
+        self._writer = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+        self.memory_manager.flush_pending()
+        self.transcript_manager.flush()
         self._game_state = None
@@ -1,32 +1,82 @@
 """Extracts claims from NPC text and updates suspicion/contradictions in StateStore."""
 import re
-from typing import List
+from typing import Dict, List, Optional, Tuple
 
-from .state_store import StateStore
-from .types import CharacterId, Claim, Contradiction, TranscriptTurn
+from .state_store import StateStore, normalize_claim_key
+from .types import CHARACTER_IDS, CHARACTER_INDEX, CharacterId, Claim, Contradiction, TranscriptTurn
+
+# Compiled once at import; re.search with literal strings pays a cache lookup per call.
+_TIME_RE = re.compile(r"\b(\d{1,2}[:\s]*\d{2}|\d{1,2}\s*(?:am|pm|o\'?clock))\b", re.I)
+_LOCATION_RE = re.compile(r"(?:at|in|near)\s+([^.?!]+?)(?:\.|,|$)", re.I)
+_PATTERNS: Tuple[re.Pattern, ...] = (_TIME_RE, _LOCATION_RE)
+_TIME_ID, _LOCATION_ID = 0, 1
+
+try:
+    import hyperscan
+except ImportError:
+    hyperscan = None
+
+# Optional Hyperscan database: runs all patterns in one pass over the text instead
+# of one O(len) scan per pattern. Falls back to the compiled re patterns above.
+_HS_DB = None
+if hyperscan is not None:
+    try:
+        _HS_DB = hyperscan.Database()
+        _HS_DB.compile(
+            expressions=[p.pattern.encode("utf-8") for p in _PATTERNS],
+            ids=list(range(len(_PATTERNS))),
+            flags=[hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_SOM_LEFTMOST] * len(_PATTERNS),
+        )
+    except Exception:
+        _HS_DB = None
+
+
+def _find_time_and_location(raw_output: str) -> Tuple[Optional[str], Optional[str]]:
+    """Return (time, location) text, using Hyperscan for the scan when available."""
+    if _HS_DB is not None:
+        data = raw_output.encode("utf-8")
+        spans: Dict[int, Tuple[int, int]] = {}
+
+        def on_match(pat_id: int, start: int, end: int, flags: int, context=None) -> None:
+            if pat_id not in spans or start < spans[pat_id][0]:
+                spans[pat_id] = (start, end)
+
+        _HS_DB.scan(data, match_event_handler=on_match)
+        results: List[Optional[str]] = [None, None]
+        # Hyperscan reports spans, not capture groups; re-match the slice to extract them.
+        for pat_id, (start, end) in spans.items():
+            m = _PATTERNS[pat_id].search(data[start:end].decode("utf-8", "ignore"))
+            if m:
+                results[pat_id] = m.group(1).strip()
+        return results[_TIME_ID], results[_LOCATION_ID]
+    time_match = _TIME_RE.search(raw_output)
+    location_match = _LOCATION_RE.search(raw_output)
+    return (
+        time_match.group(1).strip() if time_match else None,
+        location_match.group(1).strip() if location_match else None,
+    )
 
 
 def extract_claims_simple(raw_output: str, character_id: CharacterId, turn_id: int) -> List[Claim]:
     """Simple rule-based extraction: look for time/location/action patterns."""
     claims: List[Claim] = []
-    time_match = re.search(r"\b(\d{1,2}[:\s]*\d{2}|\d{1,2}\s*(?:am|pm|o\'?clock))\b", raw_output, re.I)
-    location_match = re.search(r"(?:at|in|near)\s+([^.?!]+?)(?:\.|,|$)", raw_output, re.I)
-    if time_match:
+    time_text, location_text = _find_time_and_location(raw_output)
+    if time_text:
         claims.append(
             Claim(
                 subject=character_id,
                 action="mentioned time",
-                time=time_match.group(1).strip(),
+                time=time_text,
                 source_character_id=character_id,
                 turn_id=turn_id,
             )
         )
-    if location_match:
+    if location_text:
         claims.append(
             Claim(
                 subject=character_id,
                 action="mentioned location",
-                location=location_match.group(1).strip(),
+                location=location_text,
                 source_character_id=character_id,
                 turn_id=turn_id,
             )
@@ -48,71 +98,92 @@ class AnalysisEngine:
 
     def __init__(self, state_store: StateStore) -> None:
         self.state_store = state_store
+        self.failed_turn_count = 0
 
     def process_turn(self, turn: TranscriptTurn) -> None:
         if not turn.character_id or turn.speaker_type != "NPC":
             return
+        if not turn.raw_output or turn.raw_output.startswith("["):
+            # Error sentinel from call_model (or an empty reply): analyzing it would
+            # pollute claims and inflate suspicion. Count it so callers can retry.
+            self.failed_turn_count += 1
+            return
         state = self.state_store.state
         if not state:
             return
-        claims = extract_claims_simple(turn.raw_output, turn.character_id, turn.turn_id)
-        self.state_store.add_claims(turn.character_id, claims, turn.turn_id)
+        if turn.structured_claims:
+            # Streamed turns arrive with claims already extracted incrementally.
+            claims = [Claim(**c) for c in turn.structured_claims]
+        else:
+            claims = extract_claims_simple(turn.raw_output, turn.character_id, turn.turn_id)
+        # Check before indexing so the new claims don't collide with themselves.
         self._check_contradictions(turn.character_id, claims)
+        self.state_store.add_claims(turn.character_id, claims)
         self._update_suspicion(turn.character_id)
 
     def _check_contradictions(self, character_id: CharacterId, new_claims: List[Claim]) -> None:
         state = self.state_store.state
         if not state:
             return
-        guilty_id = state.scenario.guilty_character_id
-        for other_id in state.character_states:
-            if other_id == character_id:
+        my_idx = CHARACTER_INDEX[character_id]
+        for other_idx, other_id in enumerate(CHARACTER_IDS):
+            if other_idx == my_idx:
+                continue
+            other_state = self.state_store.get_character_state(other_id)
+            if other_state is None:
                 continue
-            other_claims = state.character_states[other_id].claims
             for nc in new_claims:
-                for oc in other_claims:
-                    if nc.time and oc.time and nc.time != oc.time and nc.action == oc.action:
-                        self.state_store.add_contradiction(
-                            Contradiction(
-                                type="inter_character",
-                                character_id=character_id,
-                                other_character_id=other_id,
-                                field="time",
-                                description=f"{character_id} said {nc.time}, {other_id} said {oc.time}.",
-                                severity="medium",
+                if nc.action and nc.time:
+                    other_times = other_state.actions_to_times.get(normalize_claim_key(nc.action))
+                    if other_times:
+                        for conflicting in other_times - {normalize_claim_key(nc.time)}:
+                            self.state_store.add_contradiction(
+                                Contradiction(
+                                    type="inter_character",
+                                    character_id=character_id,
+                                    other_character_id=other_id,
+                                    field="time",
+                                    description=f"{character_id} said {nc.time}, {other_id} said {conflicting}.",
+                                    severity="medium",
+                                )
                             )
-                        )
-                    if nc.location and oc.location and nc.location != oc.location:
+                if nc.location:
+                    nc_key = normalize_claim_key(nc.location)
+                    for conflicting in other_state.locations - {nc_key}:
                         self.state_store.add_contradiction(
                             Contradiction(
                                 type="inter_character",
                                 character_id=character_id,
                                 other_character_id=other_id,
                                 field="location",
-                                description=f"{character_id} said {nc.location}, {other_id} said {oc.location}.",
+                                description=f"{character_id} said {nc.location}, {other_id} said {conflicting}.",
                                 severity="medium",
                             )
                         )
-        existing = state.character_states[character_id].claims
-        old_claims = existing[:-len(new_claims)] if len(new_claims) < len(existing) else []
+        my_state = self.state_store.get_character_state(character_id)
+        if my_state is None:
+            return
         for nc in new_claims:
-            for ec in old_claims:
-                if nc.time and ec.time and nc.time != ec.time:
-                    self.state_store.add_contradiction(
-                        Contradiction(
-                            type="self",
-                            character_id=character_id,
-                            field="time",
-                            description=f"Previously said {ec.time}, now said {nc.time}.",
-                            severity="high",
-                        )
+            if not nc.time:
+                continue
+            for old_key in my_state.claims_by_time.keys() - {normalize_claim_key(nc.time)}:
+                self.state_store.add_contradiction(
+                    Contradiction(
+                        type="self",
+                        character_id=character_id,
+                        field="time",
+                        description=f"Previously said {old_key}, now said {nc.time}.",
+                        severity="high",
                     )
+                )
 
     def _update_suspicion(self, character_id: CharacterId) -> None:
         state = self.state_store.state
         if not state:
             return
-        cs = state.character_states[character_id]
+        cs = self.state_store.get_character_state(character_id)
+        if cs is None:
+            return
         base = len(cs.contradictions) * 15.0
         if state.scenario.guilty_character_id == character_id:
             base += 10.0
@@ -0,0 +1,40 @@
+"""Crash-safe file write helper shared by the on-disk managers."""
+import os
+from pathlib import Path
+
+# With O_TMPFILE the write happens on an anonymous inode that only gains a
+# name at linkat time, so a crash mid-write leaves no orphan tmp file and no
+# directory entry to journal for the tmp name. Zero when unsupported (non-Linux).
+_O_TMPFILE = getattr(os, "O_TMPFILE", 0)
+
+
+def write_file_atomic(path: Path, data: bytes, fsync: bool = False) -> None:
+    """Write ``data`` so that ``path`` is only ever absent, old, or fully new.
+
+    New files go through O_TMPFILE + linkat where available; overwrites (and
+    non-Linux platforms) fall back to a sibling tmp file renamed over the
+    target, since linkat cannot replace an existing name.
+    """
+    if _O_TMPFILE and not path.exists():
+        try:
+            fd = os.open(path.parent, _O_TMPFILE | os.O_WRONLY, 0o644)
+        except OSError:
+            fd = -1
+        if fd >= 0:
+            try:
+                os.write(fd, data)
+                if fsync:
+                    os.fsync(fd)
+                os.link(f"/proc/self/fd/{fd}", path)
+                return
+            except OSError:
+                pass  # e.g. path appeared meanwhile; use the rename path
+            finally:
+                os.close(fd)
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    with open(tmp, "wb") as f:
+        f.write(data)
+        f.flush()
+        if fsync:
+            os.fsync(f.fileno())
+    os.replace(tmp, path)
@@ -1,7 +1,8 @@
 """Single gang member bound to an Ollama model; builds prompts and calls the model."""
-from typing import TYPE_CHECKING, List
+from typing import TYPE_CHECKING, AsyncIterator, List
 
 from .config import PERSONA_SYSTEM_PROMPTS, get_hidden_instructions
+from .inference_server import get_ollama_aclient, get_shared_batcher
 from .types import CharacterId, MemorySummary, ModelName, TranscriptTurn
 
 if TYPE_CHECKING:
@@ -13,6 +14,17 @@ try:
 except ImportError:
     ollama = None
 
+# Static prompt scaffolding assembled once; per-turn work is only the variable blocks.
+_PROMPT_TEMPLATE = (
+    "--- MEMORY RECAP ---\n"
+    "Your key claims so far: {key_claims}\n"
+    "Your alibi / story: {core_alibi}"
+    "{contradiction_block}{recent_block}\n"
+    "\n--- NEW QUESTION ---\n"
+    "The investigator asks: {question}\n"
+    "\nReply in character only, in 1-3 short paragraphs. Do not confess or break character."
+)
+
 
 class CharacterAgent:
     """One gang member: persona, model, and prompt construction."""
@@ -32,6 +44,10 @@ class CharacterAgent:
         self.guilty = guilty
         self.memory_manager = memory_manager
         self.transcript_manager = transcript_manager
+        # Persona + hidden instructions never change after init; concatenate once
+        # and keep a reusable system message.
+        self._system_prompt = persona_system_prompt + "\n\n" + get_hidden_instructions(guilty)
+        self._system_message = {"role": "system", "content": self._system_prompt}
 
     def build_prompt(
         self,
@@ -42,25 +58,29 @@ class CharacterAgent:
         recent_turns: List[TranscriptTurn],
         contradiction_notes: List[str],
     ) -> str:
-        parts = [
-            "--- MEMORY RECAP ---",
-            f"Your key claims so far: {memory_summary.key_claims or ['None yet.']}",
-            f"Your alibi / story: {memory_summary.core_alibi or 'Not yet stated.'}",
-        ]
+        contradiction_block = ""
         if contradiction_notes:
-            parts.append("Contradictions to be aware of (stay consistent or address carefully):")
-            for n in contradiction_notes[:5]:
-                parts.append(f"  - {n}")
+            contradiction_block = (
+                "\nContradictions to be aware of (stay consistent or address carefully):\n"
+                + "\n".join(f"  - {n}" for n in contradiction_notes[:5])
+            )
+        recent_block = ""
         if recent_turns:
-            parts.append("\n--- YOUR RECENT ANSWERS ---")
+            lines: List[str] = []
             for t in recent_turns[-5:]:
                 if t.player_question:
-                    parts.append(f"Investigator asked: {t.player_question[:200]}")
-                parts.append(f"You said: {t.raw_output[:300]}")
-        parts.append("\n--- NEW QUESTION ---")
-        parts.append(f"The investigator asks: {player_question}")
-        parts.append("\nReply in character only, in 1-3 short paragraphs. Do not confess or break character.")
-        return "\n".join(parts)
+                    lines.append(f"Investigator asked: {t.player_question[:200]}")
+                lines.append(f"You said: {t.raw_output[:300]}")
+            recent_block = "\n\n--- YOUR RECENT ANSWERS ---\n" + "\n".join(lines)
+        return _PROMPT_TEMPLATE.format_map(
+            {
+                "key_claims": memory_summary.key_claims or ["None yet."],
+                "core_alibi": memory_summary.core_alibi or "Not yet stated.",
+                "contradiction_block": contradiction_block,
+                "recent_block": recent_block,
+                "question": player_question,
+            }
+        )
 
     def call_model(self, prompt: str) -> str:
         if ollama is None:
@@ -68,16 +88,44 @@ class CharacterAgent:
         try:
             response = ollama.chat(
                 model=self.model_name,
-                messages=[
-                    {"role": "system", "content": self.persona_system_prompt + "\n\n" + get_hidden_instructions(self.guilty)},
-                    {"role": "user", "content": prompt},
-                ],
+                messages=[self._system_message, {"role": "user", "content": prompt}],
             )
             msg = response.get("message") or {}
             return (msg.get("content") or "").strip()
         except Exception as e:
             return f"[Error calling model: {e}]"
 
+    async def acall_model(self, prompt: str) -> str:
+        if ollama is None:
+            return "[Ollama not installed. Install with: pip install ollama]"
+        try:
+            return await get_shared_batcher().submit(
+                model=self.model_name,
+                system=self._system_prompt,
+                user=prompt,
+            )
+        except Exception as e:
+            return f"[Error calling model: {e}]"
+
+    async def astream_model(self, prompt: str) -> AsyncIterator[str]:
+        """Yield response chunks as the model produces them (stream=True)."""
+        if ollama is None:
+            yield "[Ollama not installed. Install with: pip install ollama]"
+            return
+        try:
+            stream = await get_ollama_aclient().chat(
+                model=self.model_name,
+                messages=[self._system_message, {"role": "user", "content": prompt}],
+                stream=True,
+            )
+            async for chunk in stream:
+                msg = chunk.get("message") or {}
+                content = msg.get("content") or ""
+                if content:
+                    yield content
+        except Exception as e:
+            yield f"[Error calling model: {e}]"
+
     def answer_question(
         self,
         session_id: str,
@@ -96,3 +144,22 @@ class CharacterAgent:
             contradiction_notes=contradiction_notes,
         )
         return self.call_model(prompt)
+
+    async def aanswer_question(
+        self,
+        session_id: str,
+        turn_id: int,
+        player_question: str,
+        memory_summary: MemorySummary,
+        recent_turns: List[TranscriptTurn],
+        contradiction_notes: List[str],
+    ) -> str:
+        prompt = self.build_prompt(
+            session_id=session_id,
+            turn_id=turn_id,
+            player_question=player_question,
+            memory_summary=memory_summary,
+            recent_turns=recent_turns,
+            contradiction_notes=contradiction_notes,
+        )
+        return await self.acall_model(prompt)
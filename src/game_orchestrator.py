@@ -1,4 +1,6 @@
 """Game flow: session start, interrogation turns, accusation, reveal."""
+import asyncio
+import threading
 import time
 from pathlib import Path
 from typing import List, Optional, Tuple
@@ -56,6 +58,13 @@ class GameOrchestrator:
         self.ai_manager.set_game_state(state)
         self.state_store.set_phase("interrogation")
 
+        # Load all three models while the player reads the intro, so the first
+        # question doesn't pay the cold-start cost.
+        threading.Thread(
+            target=lambda: asyncio.run(self.ai_manager.warmup_all()),
+            daemon=True,
+        ).start()
+
         intro = (
             "The Grand Muffin has been stolen from the Muffin Gang's vault. "
             "You are interrogating three members: Crumbs, Cherry, and Glaze. "
@@ -97,6 +106,46 @@ class GameOrchestrator:
         self.analysis_engine.process_turn(turn)
         return turn
 
+    def ask_many(
+        self,
+        session_id: str,
+        questions: List[Tuple[CharacterId, str]],
+    ) -> List[TranscriptTurn]:
+        """Ask several characters at once; model calls run concurrently via asyncio.gather."""
+        if self._session_id != session_id or not self.state_store.state:
+            return []
+        state = self.state_store.state
+        if state.phase != "interrogation":
+            return []
+
+        requests: List[Tuple[CharacterId, int, str]] = []
+        for character_id, question in questions:
+            cs = self.state_store.get_character_state(character_id)
+            if not cs or cs.questions_remaining <= 0:
+                continue
+            if not self.state_store.use_question(character_id):
+                continue
+            requests.append((character_id, self.state_store.increment_turn(), question))
+        if not requests:
+            return []
+
+        suspicion = self.state_store.get_suspicion_snapshot()
+        contradictions = {
+            cid: self.state_store.get_contradiction_notes_for_character(cid)
+            for cid, _turn_id, _q in requests
+        }
+        turns = asyncio.run(
+            self.ai_manager.ask_characters_batch(
+                session_id=session_id,
+                requests=requests,
+                suspicion_snapshot=suspicion,
+                contradictions_by_character=contradictions,
+            )
+        )
+        for turn in turns:
+            self.analysis_engine.process_turn(turn)
+        return turns
+
     def can_ask(self, character_id: CharacterId) -> bool:
         cs = self.state_store.get_character_state(character_id)
         return cs is not None and cs.questions_remaining > 0
@@ -109,6 +158,7 @@ class GameOrchestrator:
         correct = guilty_id == accused_character_id
         self.state_store.set_phase("ended")
         self.ai_manager.shutdown_session(session_id)
+        self.transcript_manager.checkpoint(session_id)
 
         if correct:
             reveal = f"You were right. {accused_character_id} stole the Grand Muffin."
@@ -0,0 +1,127 @@
+"""Micro-batching front-end for Ollama: queues concurrent prompts and dispatches per-model batches."""
+import asyncio
+import os
+import weakref
+from typing import Any, List, Optional, Tuple
+
+try:
+    import ollama
+except ImportError:
+    ollama = None
+
+_aclients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Any]" = weakref.WeakKeyDictionary()
+
+
+def get_ollama_aclient() -> Any:
+    """Lazily construct one AsyncClient per running event loop.
+
+    The client's httpx connection pool is bound to the loop it was created on,
+    and callers spin up a fresh asyncio.run loop per batch (warmup thread,
+    ask_many, streaming); reusing one client across loops raises
+    "Event loop is closed" once pooled keep-alive connections outlive their
+    loop. Within a loop the client still reuses its pool across all
+    characters, and the weak keying lets each client die with its loop.
+    """
+    if ollama is None:
+        raise RuntimeError("Ollama not installed. Install with: pip install ollama")
+    loop = asyncio.get_running_loop()
+    client = _aclients.get(loop)
+    if client is None:
+        client = ollama.AsyncClient(host=os.getenv("OLLAMA_HOST"))
+        _aclients[loop] = client
+    return client
+
+# One queued chat request: (model, system_prompt, user_prompt, future-for-result).
+_Request = Tuple[str, str, str, "asyncio.Future[str]"]
+
+
+class OllamaBatcher:
+    """Accumulates pending chat requests into micro-batches bounded by B_max and a timeout.
+
+    Requests arriving within the batch window are dispatched in one gather —
+    every call in flight at once, even across different models — so a mixed
+    batch costs max(latency) rather than the sum, amortizing RPC overhead and
+    keeping warm models resident across the batch.
+    """
+
+    def __init__(
+        self,
+        batch_max: int = 8,
+        batch_window_seconds: float = 0.03,
+    ) -> None:
+        self._batch_max = batch_max
+        self._window = batch_window_seconds
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queue: Optional["asyncio.Queue[_Request]"] = None
+        self._task: Optional["asyncio.Task[None]"] = None
+
+    def _ensure_running(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is loop and self._task is not None and not self._task.done():
+            return
+        # (Re)bind to the current event loop; callers may use a fresh loop per batch.
+        self._loop = loop
+        self._queue = asyncio.Queue()
+        self._task = loop.create_task(self._run())
+
+    async def submit(self, model: str, system: str, user: str) -> str:
+        """Queue one chat request; resolves with the model's reply content."""
+        if ollama is None:
+            raise RuntimeError("Ollama not installed. Install with: pip install ollama")
+        self._ensure_running()
+        assert self._queue is not None
+        fut: "asyncio.Future[str]" = asyncio.get_running_loop().create_future()
+        await self._queue.put((model, system, user, fut))
+        return await fut
+
+    async def _run(self) -> None:
+        assert self._queue is not None
+        while True:
+            batch: List[_Request] = [await self._queue.get()]
+            deadline = asyncio.get_running_loop().time() + self._window
+            while len(batch) < self._batch_max:
+                remaining = deadline - asyncio.get_running_loop().time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout=remaining))
+                except asyncio.TimeoutError:
+                    break
+            await self._dispatch(batch)
+
+    async def _dispatch(self, batch: List[_Request]) -> None:
+        client = get_ollama_aclient()  # per-loop, like the queue and worker task
+        # One gather across the whole batch: with each character bound to its
+        # own model, awaiting per-model groups in turn would serialize them.
+        results = await asyncio.gather(
+            *[
+                client.chat(
+                    model=model,
+                    messages=[
+                        {"role": "system", "content": system},
+                        {"role": "user", "content": user},
+                    ],
+                )
+                for model, system, user, _fut in batch
+            ],
+            return_exceptions=True,
+        )
+        for (_model, _system, _user, fut), result in zip(batch, results):
+            if fut.done():
+                continue
+            if isinstance(result, BaseException):
+                fut.set_exception(result)
+            else:
+                msg = result.get("message") or {}
+                fut.set_result((msg.get("content") or "").strip())
+
+
+_shared_batcher: Optional[OllamaBatcher] = None
+
+
+def get_shared_batcher() -> OllamaBatcher:
+    """Process-wide batcher so all character agents share one request queue."""
+    global _shared_batcher
+    if _shared_batcher is None:
+        _shared_batcher = OllamaBatcher()
+    return _shared_batcher
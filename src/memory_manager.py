@@ -1,11 +1,30 @@
 """Loads/saves character memory summaries and builds memory context per turn."""
 import json
-import os
+import threading
+from collections import deque
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Deque, Dict, List, Optional, Tuple
 
+from .atomic_io import write_file_atomic
 from .types import CHARACTER_IDS, CharacterId, MemorySummary, TranscriptTurn
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _dumps(data: Dict[str, Any]) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, ensure_ascii=False).encode("utf-8")
+
+
+def _loads(raw: bytes) -> Dict[str, Any]:
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
 
 def _empty_summary(character_id: CharacterId) -> MemorySummary:
     return MemorySummary(
@@ -21,11 +40,33 @@ def _empty_summary(character_id: CharacterId) -> MemorySummary:
     )
 
 
+# Rebuild a character's summary only every N of their turns.
+_SUMMARY_INTERVAL_TURNS = 3
+_KEY_CLAIMS_WINDOW = 20
+
+# Group-commit window for summary writes: saves queued within it share one flush.
+_FLUSH_INTERVAL_SECONDS = 0.025
+_FLUSH_BATCH_SIZE = 3
+
+
 class MemoryManager:
     """Manages per-character memory summaries and memory context for prompts."""
 
     def __init__(self, base_session_data_dir: str) -> None:
         self._base = Path(base_session_data_dir)
+        # In-process cache: the manager is the sole writer, so a summary read
+        # right after a save never needs to touch disk again.
+        self._cache: Dict[Tuple[str, CharacterId], MemorySummary] = {}
+        self._turns_since_summary: Dict[Tuple[str, CharacterId], int] = {}
+        self._key_claims: Dict[Tuple[str, CharacterId], Deque[str]] = {}
+        # Pending summary bytes keyed by final path; latest save wins, and the
+        # flusher thread commits a whole group per wakeup instead of one fsync
+        # per save. Reads are safe because the cache above is updated first.
+        self._pending_saves: Dict[Path, bytes] = {}
+        self._pending_lock = threading.Lock()
+        self._pending_event = threading.Event()
+        self._flusher = threading.Thread(target=self._flush_loop, daemon=True)
+        self._flusher.start()
 
     def _session_dir(self, session_id: str) -> Path:
         return self._base / f"session_{session_id}"
@@ -43,25 +84,49 @@ class MemoryManager:
                 self.save_memory_summary(session_id, _empty_summary(cid))
 
     def load_memory_summary(self, session_id: str, character_id: CharacterId) -> MemorySummary:
+        key = (session_id, character_id)
+        cached = self._cache.get(key)
+        if cached is not None:
+            return cached
         path = self._summary_path(session_id, character_id)
         if not path.exists():
             return _empty_summary(character_id)
         try:
-            with open(path, "r", encoding="utf-8") as f:
-                data = json.load(f)
-            return MemorySummary.from_dict(data)
-        except (json.JSONDecodeError, OSError):
+            with open(path, "rb") as f:
+                data = _loads(f.read())
+            summary = MemorySummary.from_dict(data)
+        except (ValueError, OSError):
             return _empty_summary(character_id)
+        self._cache[key] = summary
+        return summary
 
     def save_memory_summary(self, session_id: str, summary: MemorySummary) -> None:
+        self._cache[(session_id, summary.character_id)] = summary
         path = self._summary_path(session_id, summary.character_id)
         path.parent.mkdir(parents=True, exist_ok=True)
-        tmp = path.with_suffix(".json.tmp")
-        with open(tmp, "w", encoding="utf-8") as f:
-            json.dump(summary.to_dict(), f, indent=2)
-            f.flush()
-            os.fsync(f.fileno())
-        os.replace(tmp, path)
+        with self._pending_lock:
+            self._pending_saves[path] = _dumps(summary.to_dict())
+            batch_full = len(self._pending_saves) >= _FLUSH_BATCH_SIZE
+        if batch_full:
+            self._pending_event.set()
+
+    def _flush_loop(self) -> None:
+        while True:
+            self._pending_event.wait(timeout=_FLUSH_INTERVAL_SECONDS)
+            self._pending_event.clear()
+            self.flush_pending()
+
+    def flush_pending(self) -> None:
+        """Synchronously commit all queued summary writes (atomic tmp + rename each)."""
+        with self._pending_lock:
+            if not self._pending_saves:
+                return
+            pending, self._pending_saves = self._pending_saves, {}
+        for path, data in pending.items():
+            try:
+                write_file_atomic(path, data, fsync=True)
+            except OSError:
+                continue
 
     def get_memory_context_for_turn(
         self,
@@ -86,13 +151,23 @@ class MemoryManager:
         all_turns: List[TranscriptTurn],
     ) -> MemorySummary:
         summary = self.load_memory_summary(session_id, character_id)
-        if len(all_turns) <= 3:
+        key = (session_id, character_id)
+        self._turns_since_summary[key] = self._turns_since_summary.get(key, 0) + 1
+        if self._turns_since_summary[key] < _SUMMARY_INTERVAL_TURNS:
             return summary
         last_turn_id = max((t.turn_id for t in all_turns), default=0)
         if last_turn_id <= summary.last_updated_turn_id:
             return summary
-        key_claims: List[str] = []
+        key_claims = self._key_claims.get(key)
+        if key_claims is None:
+            key_claims = deque(summary.key_claims, maxlen=_KEY_CLAIMS_WINDOW)
+            self._key_claims[key] = key_claims
+        # Only fold in turns newer than the last summary; older ones are already there.
         for t in all_turns:
+            if t.turn_id <= summary.last_updated_turn_id:
+                continue
+            if not t.raw_output or t.raw_output.startswith("["):
+                continue  # failed/empty model call; nothing worth summarizing
             for c in t.structured_claims:
                 subj = c.get("subject", character_id)
                 action = c.get("action", "")
@@ -104,13 +179,14 @@ class MemoryManager:
             core_alibi=summary.core_alibi or "Not yet stated.",
             timeline_summary=summary.timeline_summary or "Timeline not yet established.",
             relationships_and_attitude=summary.relationships_and_attitude,
-            key_claims=key_claims[-20:],
+            key_claims=list(key_claims),
             known_self_contradictions=summary.known_self_contradictions,
             known_inter_contradictions=summary.known_inter_contradictions,
             lie_patterns=summary.lie_patterns,
             last_updated_turn_id=last_turn_id,
         )
         self.save_memory_summary(session_id, summary)
+        self._turns_since_summary[key] = 0
         return summary
 
     def recover_from_crash(self, session_id: str, character_ids: Optional[List[CharacterId]] = None) -> None:
@@ -1,12 +1,17 @@
 """Central game state: scenario, character states, claims, contradictions, suspicion."""
+import functools
 import random
-from typing import Dict, List, Optional
+import sys
+from types import MappingProxyType
+from typing import Dict, FrozenSet, List, Optional, Set, Tuple
 
 from .types import (
     CHARACTER_IDS,
+    CHARACTER_INDEX,
     CharacterId,
     CharacterState,
     Claim,
+    ClaimTable,
     Contradiction,
     GameState,
     ScenarioCanon,
@@ -16,118 +21,189 @@ from typing import Literal
 Phase = Literal["intro", "interrogation", "review", "accusation", "ended"]
 
 
+def normalize_claim_key(value: str) -> str:
+    """Normalize a claim field for use as an index key.
+
+    Keys recur heavily across buckets and sets ("9pm", "the kitchen"), so the
+    normalized form is interned: one shared string, cached hash, pointer-fast
+    equality in the contradiction set operations.
+    """
+    return sys.intern(value.strip().lower())
+
+
+# The canon is read-only ground truth: build the invariant parts once as
+# frozen tuples/proxies and share them across every session.
+_CANON_LOCATIONS: Tuple[str, ...] = ("the bakery vault", "the back room", "the kitchen")
+_TIMELINE_FROZEN: Tuple[MappingProxyType, ...] = (
+    MappingProxyType({"time": "20:00", "event": "Gang met at the bakery."}),
+    MappingProxyType({"time": "21:00", "event": "Grand Muffin was taken from the vault."}),
+    MappingProxyType({"time": "21:30", "event": "Someone left through the back."}),
+)
+_KEY_EVENTS_FROZEN: Tuple[str, ...] = ("Meeting", "Vault opened", "Muffin removed", "Escape")
+_WHO_SAW_FROZEN = MappingProxyType({
+    "Crumbs": ("Saw Cherry near the kitchen.", "Did not see Glaze after 9pm."),
+    "Cherry": ("Saw Glaze by the vault.", "Claims Crumbs was with them until 9."),
+    "Glaze": ("Saw Cherry leave early.", "Claims to have been in the back room alone."),
+})
+
+
+@functools.lru_cache(maxsize=8)
 def _make_default_canon(guilty_id: CharacterId, seed: int) -> ScenarioCanon:
+    # Deterministic in (guilty_id, seed) and immutable, so repeat sessions with
+    # the same seed share one instance via the cache.
     rng = random.Random(seed)
-    locations = ["the bakery vault", "the back room", "the kitchen"]
-    location = rng.choice(locations)
     return ScenarioCanon(
         guilty_character_id=guilty_id,
-        timeline=[
-            {"time": "20:00", "event": "Gang met at the bakery."},
-            {"time": "21:00", "event": "Grand Muffin was taken from the vault."},
-            {"time": "21:30", "event": "Someone left through the back."},
-        ],
-        location=location,
-        key_events=["Meeting", "Vault opened", "Muffin removed", "Escape"],
-        who_saw_what={
-            "Crumbs": ["Saw Cherry near the kitchen.", "Did not see Glaze after 9pm."],
-            "Cherry": ["Saw Glaze by the vault.", "Claims Crumbs was with them until 9."],
-            "Glaze": ["Saw Cherry leave early.", "Claims to have been in the back room alone."],
-        },
+        timeline=_TIMELINE_FROZEN,
+        location=rng.choice(_CANON_LOCATIONS),
+        key_events=_KEY_EVENTS_FROZEN,
+        who_saw_what=_WHO_SAW_FROZEN,
     )
 
 
+# The sentinel scenario is frozen, so one shared instance is safe.
+_EMPTY_SCENARIO = ScenarioCanon(
+    guilty_character_id=CHARACTER_IDS[0],
+    timeline=(),
+    location="",
+    key_events=(),
+    who_saw_what=MappingProxyType({}),
+)
+
+
+def _uninitialized_state() -> Tuple[GameState, Tuple[CharacterState, ...]]:
+    """Sentinel used before initialize_session: every method can operate on it
+    without a None check. Questions are exhausted and the phase is "ended", so
+    mutators no-op behaviorally and readers return empty results. Each store
+    gets its own instance — the web app runs one orchestrator per browser
+    session in a single process, so a shared sentinel would let pre-init
+    writes (increment_turn, set_phase, stray claims) leak across stores.
+    Whatever lands on it is discarded when initialize_session replaces it."""
+    char_states = tuple(
+        CharacterState(
+            character_id=cid,
+            questions_remaining=0,
+            claims=ClaimTable(),
+            suspicion_score=0.0,
+            contradictions=[],
+        )
+        for cid in CHARACTER_IDS
+    )
+    state = GameState(
+        session_id="",
+        seed=0,
+        scenario=_EMPTY_SCENARIO,
+        character_states=dict(zip(CHARACTER_IDS, char_states)),
+        total_turns=0,
+        phase="ended",
+    )
+    return state, char_states
+
+
 class StateStore:
     """Holds and updates game state: scenario, character states, suspicion, contradictions."""
 
     def __init__(self, seed: Optional[int] = None) -> None:
         self._seed = seed if seed is not None else random.randint(0, 2**31 - 1)
-        self._state: Optional[GameState] = None
+        # Same CharacterState objects as state.character_states, indexed by
+        # CHARACTER_INDEX so hot paths avoid string-keyed dict lookups.
+        self._uninitialized, self._char_states = _uninitialized_state()
+        self._state: GameState = self._uninitialized
+        # Signatures of contradictions already recorded; the same conflict gets
+        # re-detected every time a character repeats their story.
+        self._contradiction_sigs: Set[Tuple[str, FrozenSet[str], str, str]] = set()
 
     def initialize_session(self, session_id: str, questions_per_character: int = 2) -> GameState:
         rng = random.Random(self._seed)
         guilty_id = rng.choice(CHARACTER_IDS)
         scenario = _make_default_canon(guilty_id, self._seed)
-        character_states = {
-            cid: CharacterState(
+        self._char_states = tuple(
+            CharacterState(
                 character_id=cid,
                 questions_remaining=questions_per_character,
-                claims=[],
+                claims=ClaimTable(),
                 suspicion_score=0.0,
                 contradictions=[],
             )
             for cid in CHARACTER_IDS
-        }
+        )
         self._state = GameState(
             session_id=session_id,
             seed=self._seed,
             scenario=scenario,
-            character_states=character_states,
+            character_states=dict(zip(CHARACTER_IDS, self._char_states)),
             total_turns=0,
             phase="intro",
         )
+        self._contradiction_sigs = set()
         return self._state
 
     @property
     def state(self) -> Optional[GameState]:
-        return self._state
+        return self._state if self._state is not self._uninitialized else None
 
     def get_guilty_character_id(self) -> Optional[CharacterId]:
-        if not self._state:
+        if self._state is self._uninitialized:
             return None
         return self._state.scenario.guilty_character_id
 
     def get_character_state(self, character_id: CharacterId) -> Optional[CharacterState]:
-        if not self._state:
-            return None
-        return self._state.character_states.get(character_id)
+        idx = CHARACTER_INDEX.get(character_id)
+        return self._char_states[idx] if idx is not None else None
 
     def use_question(self, character_id: CharacterId) -> bool:
-        if not self._state:
-            return False
-        cs = self._state.character_states.get(character_id)
+        cs = self.get_character_state(character_id)
         if not cs or cs.questions_remaining <= 0:
             return False
         cs.questions_remaining -= 1
         return True
 
-    def add_claims(self, character_id: CharacterId, claims: List[Claim], turn_id: int) -> None:
-        if not self._state:
-            return
+    def add_claims(self, character_id: CharacterId, claims: List[Claim]) -> None:
+        # Claims arrive with source_character_id and turn_id already set at the
+        # parse site; this loop only maintains the lookup indexes.
+        cs = self._char_states[CHARACTER_INDEX[character_id]]
         for c in claims:
-            c.source_character_id = character_id
-            c.turn_id = turn_id
-        self._state.character_states[character_id].claims.extend(claims)
-
-    def add_contradiction(self, contradiction: Contradiction) -> None:
-        if not self._state:
-            return
-        self._state.character_states[contradiction.character_id].contradictions.append(contradiction)
+            if c.action:
+                action_key = normalize_claim_key(c.action)
+                cs.claims_by_action.setdefault(action_key, []).append(c)
+                if c.time:
+                    cs.actions_to_times.setdefault(action_key, set()).add(normalize_claim_key(c.time))
+            if c.time:
+                cs.claims_by_time.setdefault(normalize_claim_key(c.time), []).append(c)
+            if c.location:
+                cs.claims_by_location.setdefault(normalize_claim_key(c.location), []).append(c)
+                cs.locations.add(normalize_claim_key(c.location))
+        cs.claims.extend(claims)
+
+    def add_contradiction(self, contradiction: Contradiction) -> bool:
+        """Record a contradiction; returns False if an identical one is already known."""
+        sig = (
+            contradiction.type,
+            frozenset({contradiction.character_id, contradiction.other_character_id or ""}),
+            contradiction.field,
+            contradiction.description,
+        )
+        if sig in self._contradiction_sigs:
+            return False
+        self._contradiction_sigs.add(sig)
+        self._char_states[CHARACTER_INDEX[contradiction.character_id]].contradictions.append(contradiction)
+        return True
 
     def set_suspicion(self, character_id: CharacterId, score: float) -> None:
-        if not self._state:
-            return
-        self._state.character_states[character_id].suspicion_score = max(0.0, min(100.0, score))
+        self._char_states[CHARACTER_INDEX[character_id]].suspicion_score = max(0.0, min(100.0, score))
 
     def increment_turn(self) -> int:
-        if not self._state:
-            return 0
         self._state.total_turns += 1
         return self._state.total_turns
 
     def set_phase(self, phase: Phase) -> None:
-        if self._state:
-            self._state.phase = phase
+        self._state.phase = phase
 
     def get_suspicion_snapshot(self) -> Dict[CharacterId, float]:
-        if not self._state:
-            return {}
-        return {cid: cs.suspicion_score for cid, cs in self._state.character_states.items()}
+        return {cid: self._char_states[i].suspicion_score for cid, i in CHARACTER_INDEX.items()}
 
     def get_contradiction_notes_for_character(self, character_id: CharacterId) -> List[str]:
-        if not self._state:
-            return []
-        cs = self._state.character_states.get(character_id)
+        cs = self.get_character_state(character_id)
         if not cs:
             return []
         return [c.description for c in cs.contradictions]
@@ -1,15 +1,89 @@
-"""Manages on-disk transcripts with circular buffer and crash-safe writes."""
+"""Manages on-disk transcripts as per-character append-only logs with crash recovery."""
+import bisect
+import concurrent.futures
+import heapq
 import json
 import os
+import struct
+import threading
 import time
+from collections import OrderedDict, deque
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Deque, Dict, List, Optional, Set, Tuple
 
+from .atomic_io import write_file_atomic
 from .types import CHARACTER_IDS, CharacterId, TranscriptTurn
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _dumps(data: dict) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, ensure_ascii=False).encode("utf-8")
+
+
+def _loads(raw: bytes) -> dict:
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+# In-memory mirror of the most recent turns per character; large enough for the
+# prompt-context window (last 5) with headroom.
+_RECENT_WINDOW = 16
+
+# Group-commit window for turn durability: log appends within it share one
+# fsync of the log fd instead of paying one sync per write.
+_SYNC_INTERVAL_SECONDS = 0.01
+_SYNC_BATCH_SIZE = 32
+
+# Each record is a fixed header followed by the serialized turn:
+#   <u32 payload_length> <u64 turn_id> <payload bytes>
+_RECORD_HEADER = struct.Struct("<IQ")
+
+
+class _RecordCache:
+    """LRU of parsed log records, bounded by a byte budget.
+
+    Records are append-only and never rewritten in place, so entries keyed by
+    (log path, offset) need no invalidation; repeat reads skip both the pread
+    and the json parse.
+    """
+
+    def __init__(self, max_bytes: int) -> None:
+        self._max_bytes = max_bytes
+        self._entries: "OrderedDict[Tuple[str, int], Tuple[int, TranscriptTurn]]" = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, fd: int, path_key: str, offset: int, length: int) -> Optional[TranscriptTurn]:
+        key = (path_key, offset)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                return entry[1]
+        try:
+            payload = os.pread(fd, length, offset)
+            turn = TranscriptTurn.from_dict(_loads(payload))
+        except (ValueError, OSError):
+            return None
+        with self._lock:
+            if key not in self._entries:
+                self._entries[key] = (length, turn)
+                self._total_bytes += length
+                while self._total_bytes > self._max_bytes and self._entries:
+                    _evicted, (size, _t) = self._entries.popitem(last=False)
+                    self._total_bytes -= size
+        return turn
+
 
 class TranscriptManager:
-    """Circular buffer of max N transcript files per character; crash-safe writes."""
+    """Append-only per-character turn logs with an in-memory offset ring."""
 
     def __init__(
         self,
@@ -19,6 +93,31 @@ class TranscriptManager:
         self._base = Path(base_transcripts_dir)
         self._max = max_transcripts_per_character
         self._index_cache: Dict[str, Dict[CharacterId, Dict[str, int]]] = {}
+        self._recent: Dict[Tuple[str, CharacterId], Deque[TranscriptTurn]] = {}
+        # Cached log fds and their offset rings: (turn_id, payload_offset,
+        # payload_length) for the last _max records, in append order.
+        self._fds: Dict[Tuple[str, CharacterId], int] = {}
+        self._offsets: Dict[Tuple[str, CharacterId], Deque[Tuple[int, int, int]]] = {}
+        self._end_offsets: Dict[Tuple[str, CharacterId], int] = {}
+        # Session-wide merge of the per-character rings, kept sorted by
+        # (turn_id, character_id) so full-transcript builds need no re-merge.
+        self._turn_index: Dict[str, List[Tuple[int, CharacterId, int, int]]] = {}
+        # Guards the in-memory indexes above (_offsets, _turn_index, _recent):
+        # log_turn mutates them on the persist worker while UI threads iterate
+        # them; readers snapshot under the lock before walking. Reentrant
+        # because locked sections call _ensure_open, which locks too.
+        self._index_lock = threading.RLock()
+        self._record_cache = _RecordCache(
+            int(os.getenv("MUFFIN_TURN_CACHE_MB", "32")) * 1024 * 1024
+        )
+        # Log fds with unsynced appends, drained by a daemon thread that issues
+        # one fsync per fd per batch.
+        self._dirty_fds: Set[int] = set()
+        self._sync_lock = threading.Lock()
+        self._sync_event = threading.Event()
+        self._sync_count = 0
+        self._syncer = threading.Thread(target=self._sync_loop, daemon=True)
+        self._syncer.start()
 
     def _session_dir(self, session_id: str) -> Path:
         return self._base / f"session_{session_id}"
@@ -29,90 +128,226 @@ class TranscriptManager:
     def _index_path(self, session_id: str, character_id: CharacterId) -> Path:
         return self._char_dir(session_id, character_id) / "index.json"
 
-    def _turn_path(self, session_id: str, character_id: CharacterId, slot: int) -> Path:
-        return self._char_dir(session_id, character_id) / f"turn_{slot:03d}.txt"
+    def _log_path(self, session_id: str, character_id: CharacterId) -> Path:
+        return self._char_dir(session_id, character_id) / "turns.log"
 
     def initialize_session(self, session_id: str, character_ids: Optional[List[CharacterId]] = None) -> None:
         ids = character_ids or CHARACTER_IDS
         session_dir = self._session_dir(session_id)
-        session_dir.mkdir(parents=True, exist_ok=True)
+        # One makedirs for the shared root, then bare mkdir per leaf; the
+        # EAFP except skips exist_ok's internal stat on the common fresh path.
+        os.makedirs(session_dir, exist_ok=True)
         for cid in ids:
-            char_dir = self._char_dir(session_id, cid)
-            char_dir.mkdir(parents=True, exist_ok=True)
+            try:
+                os.mkdir(session_dir / cid)
+            except FileExistsError:
+                pass
+            self._ensure_open(session_id, cid)
             idx_path = self._index_path(session_id, cid)
             if not idx_path.exists():
-                self._write_index(session_id, cid, current_index=-1, total_written=0)
+                self._write_index(session_id, cid, total_written=0, end_offset=0)
+                with self._index_lock:
+                    self._recent[(session_id, cid)] = deque(maxlen=_RECENT_WINDOW)
+        with self._index_lock:
+            self._turn_index[session_id] = self._build_turn_index(session_id, ids)
+
+    def _build_turn_index(
+        self,
+        session_id: str,
+        character_ids: Optional[List[CharacterId]] = None,
+    ) -> List[Tuple[int, CharacterId, int, int]]:
+        ids = character_ids or CHARACTER_IDS
+        for cid in ids:
+            self._ensure_open(session_id, cid)
+        # Each ring is already in turn_id order, so a k-way merge (k = 3)
+        # replaces the O(n log n) sort of the concatenated rings. The runs are
+        # materialized per character: lazy generators would all close over the
+        # same loop variable.
+        with self._index_lock:
+            runs = [
+                [
+                    (turn_id, cid, offset, length)
+                    for turn_id, offset, length in self._offsets[(session_id, cid)]
+                ]
+                for cid in ids
+            ]
+        return list(heapq.merge(*runs))
+
+    def _ensure_open(self, session_id: str, character_id: CharacterId) -> int:
+        """Open (or return the cached) log fd, scanning the file once to seed
+        the offset ring and append position."""
+        key = (session_id, character_id)
+        with self._index_lock:
+            fd = self._fds.get(key)
+            if fd is not None:
+                return fd
+            path = self._log_path(session_id, character_id)
+            try:
+                os.makedirs(path.parent)
+            except FileExistsError:
+                pass
+            fd = os.open(path, os.O_RDWR | os.O_APPEND | os.O_CREAT, 0o644)
+            offsets: Deque[Tuple[int, int, int]] = deque(maxlen=self._max)
+            end = 0
+            size = os.fstat(fd).st_size
+            while end + _RECORD_HEADER.size <= size:
+                header = os.pread(fd, _RECORD_HEADER.size, end)
+                if len(header) < _RECORD_HEADER.size:
+                    break
+                length, turn_id = _RECORD_HEADER.unpack(header)
+                if end + _RECORD_HEADER.size + length > size:
+                    break  # torn tail record from a crash; recover_from_crash trims it
+                offsets.append((turn_id, end + _RECORD_HEADER.size, length))
+                end += _RECORD_HEADER.size + length
+            self._fds[key] = fd
+            self._offsets[key] = offsets
+            self._end_offsets[key] = end
+            return fd
 
     def _read_index(self, session_id: str, character_id: CharacterId) -> Dict[str, int]:
+        # This manager is the sole writer, so after the first disk read the
+        # cached dict is authoritative; log_turn no longer re-parses index.json.
+        cached = self._index_cache.get(session_id, {}).get(character_id)
+        if cached is not None:
+            return cached
+        state = {"total_written": 0, "end_offset": 0}
         path = self._index_path(session_id, character_id)
-        if not path.exists():
-            return {"current_index": -1, "total_written": 0}
-        try:
-            with open(path, "r", encoding="utf-8") as f:
-                data = json.load(f)
-            return {
-                "current_index": data.get("current_index", -1),
-                "total_written": data.get("total_written", 0),
-            }
-        except (json.JSONDecodeError, OSError):
-            return {"current_index": -1, "total_written": 0}
-
-    def _write_index(self, session_id: str, character_id: CharacterId, current_index: int, total_written: int) -> None:
+        if path.exists():
+            try:
+                with open(path, "rb") as f:
+                    data = _loads(f.read())
+                state = {
+                    "total_written": data.get("total_written", 0),
+                    "end_offset": data.get("end_offset", 0),
+                }
+            except (ValueError, OSError):
+                pass
+        self._index_cache.setdefault(session_id, {})[character_id] = state
+        return state
+
+    def _write_index(
+        self,
+        session_id: str,
+        character_id: CharacterId,
+        total_written: int,
+        end_offset: int,
+        fsync: bool = False,
+    ) -> None:
+        """Persist index state; fsync only at explicit checkpoints — the index is
+        fully recoverable from the log itself."""
+        # Callers reach here via initialize_session or _ensure_open, both of
+        # which have already created the character directory.
         path = self._index_path(session_id, character_id)
-        path.parent.mkdir(parents=True, exist_ok=True)
         data = {
-            "current_index": current_index,
             "total_written": total_written,
+            "end_offset": end_offset,
             "max_transcripts": self._max,
-            "updated_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            # Debug metadata only; epoch seconds avoid strftime's tz/format
+            # work on a path that runs once per turn.
+            "updated_at": int(time.time()),
+        }
+        write_file_atomic(path, _dumps(data), fsync=fsync)
+        self._index_cache.setdefault(session_id, {})[character_id] = {
+            "total_written": total_written,
+            "end_offset": end_offset,
         }
-        tmp = path.with_suffix(".tmp")
-        with open(tmp, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2)
-            f.flush()
-            os.fsync(f.fileno())
-        os.replace(tmp, path)
 
     def log_turn(self, session_id: str, character_id: CharacterId, turn: TranscriptTurn) -> None:
+        key = (session_id, character_id)
+        fd = self._ensure_open(session_id, character_id)
+        payload = _dumps(turn.to_dict())
+        record = _RECORD_HEADER.pack(len(payload), turn.turn_id) + payload
+        # O_APPEND keeps the record contiguous; a torn record can only be the
+        # tail of the log, which recovery trims.
+        os.write(fd, record)
+        with self._index_lock:
+            end = self._end_offsets[key]
+            offsets = self._offsets[key]
+            evicted = offsets[0] if len(offsets) == offsets.maxlen else None
+            entry = (turn.turn_id, end + _RECORD_HEADER.size, len(payload))
+            offsets.append(entry)
+            self._end_offsets[key] = end + len(record)
+
+            turn_index = self._turn_index.get(session_id)
+            if turn_index is not None:
+                if evicted is not None:
+                    old_id, old_offset, old_length = evicted
+                    pos = bisect.bisect_left(turn_index, (old_id, character_id, old_offset, old_length))
+                    if pos < len(turn_index) and turn_index[pos][1] == character_id:
+                        del turn_index[pos]
+                bisect.insort(turn_index, (entry[0], character_id, entry[1], entry[2]))
+
+            # Only mirror turns once the deque has been seeded (initialize_session
+            # or a first read); a partially-populated window would be mistaken
+            # for truth.
+            recent = self._recent.get(key)
+            if recent is not None:
+                recent.append(turn)
+        self._mark_dirty(fd)
+
         idx = self._read_index(session_id, character_id)
-        current = idx["current_index"]
-        total = idx["total_written"]
-        next_slot = (current + 1) % self._max
-        total_new = total + 1
-
-        path = self._turn_path(session_id, character_id, next_slot)
-        path.parent.mkdir(parents=True, exist_ok=True)
-        content = json.dumps(turn.to_dict(), indent=2, ensure_ascii=False)
-        tmp = path.with_suffix(".txt.tmp")
-        with open(tmp, "w", encoding="utf-8") as f:
-            f.write(content)
-            f.flush()
-            os.fsync(f.fileno())
-        os.replace(tmp, path)
-
-        self._write_index(session_id, character_id, next_slot, total_new)
+        self._write_index(session_id, character_id, idx["total_written"] + 1, self._end_offsets[key])
+
+    def _mark_dirty(self, fd: int) -> None:
+        with self._sync_lock:
+            self._dirty_fds.add(fd)
+            self._sync_count += 1
+            batch_full = self._sync_count >= _SYNC_BATCH_SIZE
+        if batch_full:
+            self._sync_event.set()
+
+    def _sync_loop(self) -> None:
+        while True:
+            self._sync_event.wait(timeout=_SYNC_INTERVAL_SECONDS)
+            self._sync_event.clear()
+            self.flush()
+
+    def flush(self) -> None:
+        """Synchronously fsync every log fd with unsynced appends."""
+        with self._sync_lock:
+            if not self._dirty_fds:
+                return
+            dirty, self._dirty_fds = self._dirty_fds, set()
+            self._sync_count = 0
+        for fd in dirty:
+            try:
+                os.fsync(fd)
+            except OSError:
+                pass
+
+    def checkpoint(self, session_id: str, character_ids: Optional[List[CharacterId]] = None) -> None:
+        """Durably sync all pending writes and index files for a session."""
+        self.flush()
+        for cid in character_ids or CHARACTER_IDS:
+            idx = self._read_index(session_id, cid)
+            self._write_index(session_id, cid, idx["total_written"], idx["end_offset"], fsync=True)
 
     def get_character_turns(self, session_id: str, character_id: CharacterId) -> List[TranscriptTurn]:
-        idx = self._read_index(session_id, character_id)
-        current = idx["current_index"]
-        total = idx["total_written"]
-        if total == 0:
-            return []
+        key = (session_id, character_id)
+        fd = self._ensure_open(session_id, character_id)
+        path_key = str(self._log_path(session_id, character_id))
+        with self._index_lock:
+            entries = list(self._offsets[key])
         turns: List[TranscriptTurn] = []
-        n = min(total, self._max)
-        for i in range(n):
-            slot = (current - i + self._max) % self._max
-            path = self._turn_path(session_id, character_id, slot)
-            if not path.exists():
-                continue
-            try:
-                with open(path, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-                turns.append(TranscriptTurn.from_dict(data))
-            except (json.JSONDecodeError, OSError):
-                continue
-        turns.reverse()
-        return sorted(turns, key=lambda t: t.turn_id)
+        for _turn_id, offset, length in entries:
+            turn = self._record_cache.get(fd, path_key, offset, length)
+            if turn is not None:
+                turns.append(turn)
+        return turns
+
+    def _read_last_n(self, session_id: str, character_id: CharacterId, n: int) -> List[TranscriptTurn]:
+        """Read only the trailing n records of a character's ring."""
+        key = (session_id, character_id)
+        fd = self._ensure_open(session_id, character_id)
+        path_key = str(self._log_path(session_id, character_id))
+        with self._index_lock:
+            entries = list(self._offsets[key])[-n:]
+        turns: List[TranscriptTurn] = []
+        for _turn_id, offset, length in entries:
+            turn = self._record_cache.get(fd, path_key, offset, length)
+            if turn is not None:
+                turns.append(turn)
+        return turns
 
     def get_character_last_n_turns(
         self,
@@ -120,19 +355,70 @@ class TranscriptManager:
         character_id: CharacterId,
         n: int,
     ) -> List[TranscriptTurn]:
-        all_turns = self.get_character_turns(session_id, character_id)
-        return all_turns[-n:] if n > 0 else []
+        if n <= 0:
+            return []
+        key = (session_id, character_id)
+        with self._index_lock:
+            recent = self._recent.get(key)
+            mirror = list(recent) if recent is not None else None
+        if mirror is None:
+            # Cold start (e.g. resumed session): seed the mirror from disk once.
+            seeded = self._read_last_n(session_id, character_id, _RECENT_WINDOW)
+            with self._index_lock:
+                recent = self._recent.get(key)
+                if recent is None:
+                    recent = deque(seeded, maxlen=_RECENT_WINDOW)
+                    self._recent[key] = recent
+                mirror = list(recent)
+        if n < len(mirror):
+            return mirror[-n:]
+        if len(mirror) < _RECENT_WINDOW:
+            return mirror
+        # Caller wants more than the mirror holds; read just that many records.
+        return self._read_last_n(session_id, character_id, n)
+
+    def preload_session(self, session_id: str, character_ids: Optional[List[CharacterId]] = None) -> None:
+        """Warm the record cache and recent mirrors for a resumed session.
+
+        Each character's log is read on its own thread, so the three
+        independent I/O streams overlap instead of serializing the first
+        prompt-context build after a resume.
+        """
+        ids = character_ids or CHARACTER_IDS
+
+        def _load(cid: CharacterId) -> None:
+            fd = self._ensure_open(session_id, cid)
+            path_key = str(self._log_path(session_id, cid))
+            with self._index_lock:
+                entries = list(self._offsets[(session_id, cid)])
+            for _turn_id, offset, length in entries:
+                self._record_cache.get(fd, path_key, offset, length)
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=len(ids)) as pool:
+            list(pool.map(_load, ids))
+        for cid in ids:
+            key = (session_id, cid)
+            seeded = self._read_last_n(session_id, cid, _RECENT_WINDOW)
+            with self._index_lock:
+                if key not in self._recent:
+                    self._recent[key] = deque(seeded, maxlen=_RECENT_WINDOW)
 
     def get_full_transcript(self, session_id: str) -> List[TranscriptTurn]:
         """Aggregate all character turns into one list sorted by turn_id."""
-        seen_turn_ids: set = set()
+        with self._index_lock:
+            turn_index = self._turn_index.get(session_id)
+            if turn_index is None:
+                turn_index = self._build_turn_index(session_id)
+                self._turn_index[session_id] = turn_index
+            entries = list(turn_index)
+        # turn_ids come from one global counter, so a turn belongs to exactly
+        # one character and no de-dup pass is needed.
         out: List[TranscriptTurn] = []
-        for cid in CHARACTER_IDS:
-            for t in self.get_character_turns(session_id, cid):
-                if t.turn_id not in seen_turn_ids:
-                    seen_turn_ids.add(t.turn_id)
-                    out.append(t)
-        out.sort(key=lambda t: (t.turn_id, t.character_id or ""))
+        for _turn_id, cid, offset, length in entries:
+            fd = self._ensure_open(session_id, cid)
+            turn = self._record_cache.get(fd, str(self._log_path(session_id, cid)), offset, length)
+            if turn is not None:
+                out.append(turn)
         return out
 
     def get_filtered_transcript_by_character(
@@ -143,13 +429,46 @@ class TranscriptManager:
         return self.get_character_turns(session_id, character_id)
 
     def recover_from_crash(self, session_id: str, character_ids: Optional[List[CharacterId]] = None) -> None:
+        self.flush()
         ids = character_ids or CHARACTER_IDS
-        for cid in ids:
-            char_dir = self._char_dir(session_id, cid)
-            if not char_dir.exists():
-                continue
-            for f in char_dir.glob("*.tmp"):
+        with self._index_lock:
+            # Drop cached state; the rebuild below repopulates it from disk truth.
+            self._index_cache.pop(session_id, None)
+            self._turn_index.pop(session_id, None)
+            for cid in ids:
+                key = (session_id, cid)
+                fd = self._fds.pop(key, None)
+                if fd is not None:
+                    try:
+                        os.close(fd)
+                    except OSError:
+                        pass
+                self._offsets.pop(key, None)
+                self._end_offsets.pop(key, None)
+                self._recent.pop(key, None)
+                char_dir = self._char_dir(session_id, cid)
+                if not char_dir.exists():
+                    continue
+                for f in char_dir.glob("*.tmp"):
+                    try:
+                        f.unlink()
+                    except OSError:
+                        pass
+                # The index is written without fsync on the hot path, so after a
+                # crash it may lag the log; rescan the log, trim any torn tail
+                # record, and rebuild the index from what actually survived.
+                self._ensure_open(session_id, cid)
+                end = self._end_offsets[key]
                 try:
-                    f.unlink()
+                    if os.fstat(self._fds[key]).st_size > end:
+                        os.ftruncate(self._fds[key], end)
                 except OSError:
                     pass
+                self._write_index(
+                    session_id, cid,
+                    total_written=len(self._offsets[key]),
+                    end_offset=end,
+                    fsync=True,
+                )
+            self._turn_index[session_id] = self._build_turn_index(session_id, ids)
+        self.preload_session(session_id, ids)
@@ -1,14 +1,20 @@
 """Shared types and data models for the Muffin Gang Interrogation Game."""
+import array
+import sys
 from dataclasses import dataclass, field
-from typing import Any, Dict, List, Literal, Optional
+from typing import Any, Dict, Iterable, Iterator, List, Literal, Mapping, Optional, Set, Tuple
 
 CharacterId = Literal["Crumbs", "Cherry", "Glaze"]
 ModelName = Literal["gemma3:4b", "qwen3:8b", "llama2-uncensored"]
 
-CHARACTER_IDS: List[CharacterId] = ["Crumbs", "Cherry", "Glaze"]
+CHARACTER_IDS: Tuple[CharacterId, ...] = ("Crumbs", "Cherry", "Glaze")
 
+# Fixed cast of three: internal hot paths index a tuple by these ints instead of
+# hashing CharacterId strings; strings remain the public/UI representation.
+CHARACTER_INDEX: Dict[CharacterId, int] = {cid: i for i, cid in enumerate(CHARACTER_IDS)}
 
-@dataclass
+
+@dataclass(slots=True)
 class TranscriptTurn:
     """One turn in the interrogation (player question or NPC answer)."""
     session_id: str
@@ -36,10 +42,13 @@ class TranscriptTurn:
 
     @classmethod
     def from_dict(cls, d: Dict[str, Any]) -> "TranscriptTurn":
+        character_id = d.get("character_id")
         return cls(
             session_id=d["session_id"],
             turn_id=d["turn_id"],
-            character_id=d.get("character_id"),
+            # Interning collapses parsed ids onto the CHARACTER_IDS constants,
+            # so downstream dict lookups compare by pointer, not content.
+            character_id=sys.intern(character_id) if character_id else None,
             speaker_type=d["speaker_type"],
             timestamp=d["timestamp"],
             player_question=d.get("player_question"),
@@ -49,7 +58,7 @@ class TranscriptTurn:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class MemorySummary:
     """Per-character memory summary for prompt injection."""
     character_id: CharacterId
@@ -78,7 +87,7 @@ class MemorySummary:
     @classmethod
     def from_dict(cls, d: Dict[str, Any]) -> "MemorySummary":
         return cls(
-            character_id=d["character_id"],
+            character_id=sys.intern(d["character_id"]),
             core_alibi=d.get("core_alibi", ""),
             timeline_summary=d.get("timeline_summary", ""),
             relationships_and_attitude=d.get("relationships_and_attitude", ""),
@@ -90,7 +99,7 @@ class MemorySummary:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class Claim:
     """Structured claim extracted from an NPC statement."""
     subject: str
@@ -102,7 +111,54 @@ class Claim:
     turn_id: int = 0
 
 
-@dataclass
+@dataclass(slots=True)
+class ClaimTable:
+    """Columnar store of claims: one list per field instead of a list of objects.
+
+    Scans that touch only a field or two (times, locations) iterate a tight
+    homogeneous list; `Claim` objects are materialized on demand as views.
+    """
+    subjects: List[str] = field(default_factory=list)
+    actions: List[str] = field(default_factory=list)
+    times: List[Optional[str]] = field(default_factory=list)
+    locations: List[Optional[str]] = field(default_factory=list)
+    certainties: List[str] = field(default_factory=list)
+    source_character_ids: List[Optional[CharacterId]] = field(default_factory=list)
+    turn_ids: array.array = field(default_factory=lambda: array.array("i"))
+
+    def append(self, claim: Claim) -> None:
+        self.subjects.append(claim.subject)
+        self.actions.append(claim.action)
+        self.times.append(claim.time)
+        self.locations.append(claim.location)
+        self.certainties.append(claim.certainty)
+        self.source_character_ids.append(claim.source_character_id)
+        self.turn_ids.append(claim.turn_id)
+
+    def extend(self, claims: Iterable[Claim]) -> None:
+        for claim in claims:
+            self.append(claim)
+
+    def row(self, i: int) -> Claim:
+        return Claim(
+            subject=self.subjects[i],
+            action=self.actions[i],
+            time=self.times[i],
+            location=self.locations[i],
+            certainty=self.certainties[i],
+            source_character_id=self.source_character_ids[i],
+            turn_id=self.turn_ids[i],
+        )
+
+    def __len__(self) -> int:
+        return len(self.subjects)
+
+    def __iter__(self) -> Iterator[Claim]:
+        for i in range(len(self.subjects)):
+            yield self.row(i)
+
+
+@dataclass(slots=True)
 class Contradiction:
     """Detected contradiction between claims or within one character."""
     type: Literal["self", "inter_character"]
@@ -113,27 +169,36 @@ class Contradiction:
     severity: Literal["low", "medium", "high"] = "medium"
 
 
-@dataclass
+@dataclass(slots=True)
 class CharacterState:
     """Per-character game state."""
     character_id: CharacterId
     questions_remaining: int
-    claims: List[Claim]
+    claims: ClaimTable
     suspicion_score: float
     contradictions: List[Contradiction]
+    # Claims indexed by normalized field value, maintained by StateStore.add_claims,
+    # so contradiction checks are bucket lookups instead of full scans.
+    claims_by_action: Dict[str, List[Claim]] = field(default_factory=dict)
+    claims_by_time: Dict[str, List[Claim]] = field(default_factory=dict)
+    claims_by_location: Dict[str, List[Claim]] = field(default_factory=dict)
+    # Normalized-value sets for C-level contradiction comparisons.
+    actions_to_times: Dict[str, Set[str]] = field(default_factory=dict)
+    locations: Set[str] = field(default_factory=set)
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ScenarioCanon:
-    """Canonical heist scenario (ground truth)."""
+    """Canonical heist scenario (ground truth); immutable once built, so
+    instances can be shared across sessions with the same seed."""
     guilty_character_id: CharacterId
-    timeline: List[Dict[str, Any]]
+    timeline: Tuple[Mapping[str, Any], ...]
     location: str
-    key_events: List[str]
-    who_saw_what: Dict[CharacterId, List[str]]
+    key_events: Tuple[str, ...]
+    who_saw_what: Mapping[CharacterId, Tuple[str, ...]]
 
 
-@dataclass
+@dataclass(slots=True)
 class GameState:
     """Full game state for a session."""
     session_id: str